@@ -1,19 +1,24 @@
 import os
+import sys
+import re
 import json
+import hashlib
+import locale
 import zipfile
+import zlib
 import csv
 import datetime
 import platform
 import shutil
 import logging
-import keyboard
-import matplotlib.pyplot as plt
+import time
+import tempfile
 from enum import Enum
-from collections import defaultdict, Counter
-from _collections_abc import MutableMapping
-from send2trash import send2trash
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from collections.abc import Callable, Iterator
+from typing import Literal, TypeVar
 
 
 NOTES_DIR = 'notes'
@@ -24,6 +29,41 @@ PDF_DIR = 'pdf'
 ACTIONS_FILE = 'actions.txt'
 TXT_EXTENSION = '.txt'
 PLOTS_DIR = 'plots'
+NOTES_PREFIX = NOTES_DIR + os.sep
+WORD_PATTERN = re.compile(r'\w+')
+BACKUP_PATTERN = re.compile(r'notes_backup_(\d{4}-\d{2}-\d{2})\.zip')
+IO_WORKERS = (os.cpu_count() or 1) * 2
+READ_BATCH_SIZE = 64
+BACKUP_COMPRESSLEVEL = 3
+WRITE_BUFFER_SIZE = 1 << 20
+PLOT_TOP_WORDS = 30
+PDF_SIGNATURE_FILE = os.path.join(PDF_DIR, '.last_sig')
+SEARCH_CACHE_SIZE = 32
+
+MENU = (
+    '1 - list of notes\n'
+    '2 - search note by keyword\n'
+    '3 - create note\n'
+    '4 - open note\n'
+    '5 - delete note permanently\n'
+    '6 - send note to trash\n'
+    '7 - update note\n'
+    '8 - create new backup\n'
+    '9 - delete old backups\n'
+    '10 - export to JSON\n'
+    '11 - export to CSV\n'
+    '12 - export to PDF\n'
+    '13 - note semantic analysis\n'
+    '14 - activity diagram\n'
+    '15 - EXIT\n'
+)
+
+T = TypeVar('T')
+
+_notes_cache: list[str] | None = None
+_notes_cache_mtime: int = -1
+_search_cache: dict[str, Counter[str]] = {}
+_search_cache_signature: str = ''
 
 
 class Actions(Enum):
@@ -71,37 +111,162 @@ def log_note_action(action, note_title) -> None:
     logging.info(f'Action: {action} | Note: {note_title}')
 
 
-def list_notes() -> None:
+def clear_cache() -> None:
+    """
+    Invalidates cached listing of notes directory and search results
+    """
+    global _notes_cache
+    _notes_cache = None
+    _search_cache.clear()
+
+
+def _get_notes() -> list[str]:
+    """
+    Returns sorted filenames of saved notes. Listing of notes directory
+    is cached until it is invalidated by `clear_cache` or modification
+    time of notes directory changes.
+
+    Returns
+    ------------
+    notes : list[str]
+        Sorted filenames of notes
+    """
+    global _notes_cache, _notes_cache_mtime
+    mtime = os.stat(NOTES_DIR).st_mtime_ns
+    if _notes_cache is None or mtime != _notes_cache_mtime:
+        with os.scandir(NOTES_DIR) as it:
+            _notes_cache = sorted(entry.name for entry in it
+                                  if entry.name.endswith(TXT_EXTENSION))
+        _notes_cache_mtime = mtime
+    return _notes_cache
+
+
+def _notes_signature(notes: list[str]) -> str:
+    """
+    Creates signature of notes from their filenames, modification times
+    and sizes
+
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes
+
+    Returns
+    ------------
+    signature : str
+        Hex digest, which changes whenever some note is changed
+    """
+    digest = hashlib.blake2b()
+    for note in notes:
+        stat = os.stat(NOTES_PREFIX + note)
+        digest.update(f'{note}\0{stat.st_mtime_ns}\0{stat.st_size}\0'.encode())
+    return digest.hexdigest()
+
+
+def _read_note(note: str) -> tuple[str, str]:
+    """
+    Reads note`s content
+
+    Parameters
+    ------------
+    note : str
+        Note`s filename
+
+    Returns
+    ------------
+    note : str
+        Note`s filename
+    content : str
+        Note`s content
+    """
+    with open(NOTES_PREFIX + note, 'r') as file:
+        return note, file.read()
+
+
+def _map_notes(function: Callable[[str], T],
+               notes: list[str]) -> Iterator[T]:
+    """
+    Applies function to notes concurrently, `READ_BATCH_SIZE` notes at a
+    time, so that only one batch of results is kept in memory
+
+    Parameters
+    ------------
+    function : Callable[[str], T]
+        Function reading note by its filename
+    notes : list[str]
+        Filenames of notes
+
+    Yields
+    ------------
+    result : T
+        Function`s results in order of notes
+    """
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        for start in range(0, len(notes), READ_BATCH_SIZE):
+            batch = notes[start:start + READ_BATCH_SIZE]
+            yield from executor.map(function, batch)
+
+
+def _read_notes(notes: list[str]) -> Iterator[tuple[str, str]]:
+    """
+    Reads notes concurrently
+
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes
+
+    Yields
+    ------------
+    note : str
+        Note`s filename
+    content : str
+        Note`s content
+    """
+    return _map_notes(_read_note, notes)
+
+
+def list_notes(notes: list[str]) -> None:
     """
     List of available notes
+
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
     """
-    notes = [f.lower() for f in os.listdir(NOTES_DIR)
-             if f.endswith(TXT_EXTENSION)]
     if not notes:
         print('There is no saved notes')
     else:
         print('===================')
         print('Existing notes:')
         for index, note in enumerate(notes):
-            print(f'  {index + 1} - {note[:-4]}')
+            title = note.removesuffix(TXT_EXTENSION)
+            print(f'  {index + 1} - {title.lower()}')
         print('===================')
 
 
-def open_note() -> None:
+def open_note(notes: list[str]) -> None:
     """
     Function that allows user to choose number of note which he wants to open
 
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
+
     Raises
     -------------
     ValueError
         If `note_number` cannot be converted into int
     """
-    list_notes()
+    import keyboard
+
+    list_notes(notes)
     note_number = input('  Enter note number: ')
 
     try:
         note_num = int(note_number)
-        notes = [f for f in os.listdir(NOTES_DIR) if f.endswith(TXT_EXTENSION)]
         if 1 <= note_num <= len(notes):
             path = os.path.join(NOTES_DIR, notes[note_num - 1])
             with open(path, 'r') as file:
@@ -116,6 +281,76 @@ def open_note() -> None:
         print('  Entered number is not integer!')
 
 
+def _count_keyword(note: str, keyword: str,
+                   ascii_keyword: bytes | None) -> int:
+    """
+    Counts keyword occurrences in note`s content. ASCII notes are
+    lowercased and searched as bytes, other notes are decoded first.
+
+    Parameters
+    ------------
+    note : str
+        Note`s filename
+    keyword : str
+        Lowercased keyword
+    ascii_keyword : bytes | None
+        Lowercased keyword encoded as ASCII, `None` if keyword is not ASCII
+
+    Returns
+    ------------
+    count : int
+        Number of keyword occurrences
+    """
+    with open(NOTES_PREFIX + note, 'rb') as file:
+        data = file.read()
+    if data.isascii():
+        if ascii_keyword is None:
+            return 0
+        return data.lower().count(ascii_keyword)
+    text = data.decode(locale.getpreferredencoding(False))
+    return text.lower().count(keyword)
+
+
+def _keyword_counts(keyword: str) -> Counter[str]:
+    """
+    Counts keyword occurrences in every note. Results of the last
+    `SEARCH_CACHE_SIZE` keywords are kept until some note is created,
+    changed or removed.
+
+    Parameters
+    ------------
+    keyword : str
+        Lowercased keyword
+
+    Returns
+    ------------
+    counts : Counter[str]
+        Number of keyword occurrences by filename of notes containing it
+    """
+    global _search_cache_signature
+    notes = _get_notes()
+    signature = _notes_signature(notes)
+    if signature != _search_cache_signature:
+        _search_cache.clear()
+        _search_cache_signature = signature
+    if keyword in _search_cache:
+        # Move keyword to the end, so that it is evicted last
+        counts = _search_cache[keyword] = _search_cache.pop(keyword)
+        return counts
+
+    ascii_keyword = keyword.encode() if keyword.isascii() else None
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        results = executor.map(_count_keyword, notes, repeat(keyword),
+                               repeat(ascii_keyword))
+        counts = Counter({note: count
+                          for note, count in zip(notes, results) if count})
+
+    if len(_search_cache) >= SEARCH_CACHE_SIZE:
+        del _search_cache[next(iter(_search_cache))]
+    _search_cache[keyword] = counts
+    return counts
+
+
 def search_note_by_keyword() -> None:
     """
     To search note by entered keyword
@@ -123,21 +358,56 @@ def search_note_by_keyword() -> None:
     keyword: str = input('  Enter keyword: ').lower()
     found: bool = False
 
-    for note in os.listdir(NOTES_DIR):
-        if note.endswith(TXT_EXTENSION):
-            with open(os.path.join(NOTES_DIR, note), 'r') as file:
-                text = ''.join([line.lower() for line in file.readlines()])
-                if keyword in text:
-                    print(
-                        (f'  Keyword "{keyword}" was found in '
-                         f'"{note.removesuffix(TXT_EXTENSION)}" '
-                         f'note: {text.count(keyword.lower())}'))
-                    found = True
+    counts = _keyword_counts(keyword)
+    for note in sorted(counts):
+        if counts[note]:
+            print(
+                (f'  Keyword "{keyword}" was found in '
+                 f'"{note.removesuffix(TXT_EXTENSION)}" '
+                 f'note: {counts[note]}'))
+            found = True
 
     if not found:
         print('There is no notes which includes entered keyword!')
 
 
+def _write_note(filename: str, content: str,
+                exclusive: bool = False) -> None:
+    """
+    Writes note`s content into temporary file and replaces note with it,
+    so that note is never left partially written
+
+    Parameters
+    ------------
+    filename : str
+        Path to note
+    content : str
+        Note`s content
+    exclusive : bool
+        If `True`, note`s name is claimed first, so that existing note is
+        never replaced
+
+    Raises
+    ------------
+    FileExistsError
+        If `exclusive` is `True` and note already exists
+    """
+    descriptor, temporary_filename = tempfile.mkstemp(dir=NOTES_DIR,
+                                                      suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', buffering=WRITE_BUFFER_SIZE) as file:
+            file.write(content)
+        if exclusive:
+            flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+            os.close(os.open(filename, flags, 0o666))
+        # mkstemp creates owner-only files, keep permissions of the note
+        shutil.copymode(filename, temporary_filename)
+        os.replace(temporary_filename, filename)
+    finally:
+        if os.path.exists(temporary_filename):
+            os.remove(temporary_filename)
+
+
 def create_note() -> None:
     """
     Creation of new note
@@ -145,41 +415,47 @@ def create_note() -> None:
     title = input('  Enter note title: ')
     content = input('  Enter note content: ')
 
-    filename = os.path.join(NOTES_DIR, f'{title}.txt')
+    note = title + TXT_EXTENSION
+    filename = NOTES_PREFIX + note
 
-    if os.path.exists(filename):
+    try:
+        _write_note(filename, content, exclusive=True)
+    except FileExistsError:
         print('  Note with that title already exists!')
-
-    with open(filename, 'w') as file:
-        file.write(content)
+        return
+    clear_cache()
 
     log_note_action(Actions.CREATE, title)
 
 
-def update_note() -> None:
+def update_note(notes: list[str]) -> None:
     """
     Update note which was chosen by user.
 
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
+
     Raises
     -------------
     ValueError
         If `note_number` cannot be converted into `int`
     """
-    list_notes()
+    list_notes(notes)
     note_number = input('  Enter note number: ')
 
     try:
         note_num = int(note_number)
-        notes = [file for file in os.listdir(
-            NOTES_DIR) if file.endswith(TXT_EXTENSION)]
         if 1 <= note_num <= len(notes):
             old_filename = os.path.join(NOTES_DIR, notes[note_num - 1])
             new_title = input('  Enter new note title: ')
             new_content = input('  Enter new note content: ')
-            new_filename = os.path.join(NOTES_DIR, f'{new_title}.txt')
+            new_note = new_title + TXT_EXTENSION
+            new_filename = NOTES_PREFIX + new_note
             os.rename(old_filename, new_filename)
-            with open(new_filename, 'w') as file:
-                file.write(new_content)
+            _write_note(new_filename, new_content)
+            clear_cache()
             log_note_action(Actions.UPDATE, new_title)
         else:
             print(f'Note number should be in ({1}, {len(notes)})')
@@ -187,24 +463,29 @@ def update_note() -> None:
         print('  Entered number is not integer!')
 
 
-def delete_note() -> None:
+def delete_note(notes: list[str]) -> None:
     """
     Removing note which was chosen by user.
 
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
+
     Raises
     -------------
     ValueError
         If `note_number` cannot be converted into int
     """
-    list_notes()
+    list_notes(notes)
     note_number = input('  Enter note number: ')
 
     try:
         note_num = int(note_number)
-        notes = [file for file in os.listdir(NOTES_DIR)]
         if 1 <= note_num <= len(notes):
             filename = os.path.join(NOTES_DIR, notes[note_num - 1])
             os.remove(filename)
+            clear_cache()
             log_note_action(Actions.DELETE.name, notes[note_num - 1])
         else:
             print(f'Note number should be in ({1}, {len(notes)})')
@@ -212,22 +493,28 @@ def delete_note() -> None:
         print('  Entered number is not integer!')
 
 
-def send_note_to_trash() -> None:
+def send_note_to_trash(notes: list[str]) -> None:
     """
     Sending note to trash.
 
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
+
     Raises
     -------------
     ValueError
         If `note_number` cannot be converted into int
     """
-    list_notes()
+    from send2trash import send2trash
+
+    list_notes(notes)
 
     note_number = input('  Enter note number: ')
 
     try:
         note_num = int(note_number)
-        notes = [f for f in os.listdir(NOTES_DIR) if f.endswith(TXT_EXTENSION)]
         if 1 <= note_num <= len(notes):
             filename = os.path.join(NOTES_DIR, notes[note_num - 1])
             if platform.system() == 'Windows':
@@ -236,6 +523,7 @@ def send_note_to_trash() -> None:
                 trash_path = os.path.expanduser("~/.local/share/Trash/files/")
                 os.makedirs(trash_path, exist_ok=True)
                 shutil.move(filename, trash_path)
+            clear_cache()
             print(f'  {filename} was sent to trash!')
         else:
             print(f'Note number should be in ({1}, {len(notes)})')
@@ -243,33 +531,140 @@ def send_note_to_trash() -> None:
         print('Note number should be integer!')
 
 
+def _reusable_backup(notes: list[str]) -> tuple[str, set[str]] | None:
+    """
+    Finds latest backup and checks that every note archived in it still
+    exists with the same size, modification time and CRC, so that the
+    backup can be extended with new notes instead of being compressed
+    again.
+
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes
+
+    Returns
+    ------------
+    backup : tuple[str, set[str]] | None
+        Path to latest backup and filenames of notes archived in it,
+        `None` if there is no backup or some archived note was changed
+    """
+    with os.scandir(BACKUP_DIR) as it:
+        backups = [entry for entry in it if entry.name.endswith('.zip')]
+    if not backups:
+        return None
+    latest = max(backups, key=lambda entry: entry.stat().st_mtime)
+
+    try:
+        with zipfile.ZipFile(latest.path) as zip_file:
+            infos = zip_file.infolist()
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+    existing = set(notes)
+    for info in infos:
+        if info.filename not in existing:
+            return None
+        stat = os.stat(NOTES_PREFIX + info.filename)
+        date_time = time.localtime(stat.st_mtime)[:6]
+        # ZIP stores modification time with two seconds precision
+        date_time = date_time[:5] + (date_time[5] // 2 * 2,)
+        if info.file_size != stat.st_size or info.date_time != date_time:
+            return None
+
+    # Size and two seconds mtime do not prove content is unchanged
+    crcs = _map_notes(_note_crc, [info.filename for info in infos])
+    if any(info.CRC != crc for info, crc in zip(infos, crcs)):
+        return None
+    return latest.path, {info.filename for info in infos}
+
+
+def _note_crc(note: str) -> int:
+    """
+    Computes CRC-32 of note`s content, as stored in ZIP archives
+
+    Parameters
+    ------------
+    note : str
+        Note`s filename
+
+    Returns
+    ------------
+    crc : int
+        CRC-32 of note`s content
+    """
+    with open(NOTES_PREFIX + note, 'rb') as file:
+        return zlib.crc32(file.read())
+
+
+def _read_archive_entry(note: str) -> tuple[zipfile.ZipInfo, bytes]:
+    """
+    Reads note to be written into backup
+
+    Parameters
+    ------------
+    note : str
+        Note`s filename
+
+    Returns
+    ------------
+    info : zipfile.ZipInfo
+        Archive entry with note`s modification time
+    data : bytes
+        Note`s content
+    """
+    path = NOTES_PREFIX + note
+    info = zipfile.ZipInfo.from_file(path, arcname=note)
+    with open(path, 'rb') as file:
+        return info, file.read()
+
+
 def create_backup() -> None:
     """
-    Create note`s backup
+    Create note`s backup. If notes archived in the latest backup were not
+    changed since, that backup is copied and only new notes are added.
     """
-    timestamp = datetime.datetime.now().date()
+    timestamp = datetime.date.today().isoformat()
     backup_filename = os.path.join(BACKUP_DIR, f'notes_backup_{timestamp}.zip')
 
-    with zipfile.ZipFile(backup_filename, 'w') as zip_file:
-        for note in os.listdir(NOTES_DIR):
-            if note.endswith(TXT_EXTENSION):
-                zip_file.write(os.path.join(NOTES_DIR, note), arcname=note)
+    notes = _get_notes()
+    mode: Literal['w', 'a'] = 'w'
+    archived: set[str] = set()
+    previous = _reusable_backup(notes)
+    if previous is not None:
+        previous_filename, archived = previous
+        if previous_filename != backup_filename:
+            shutil.copyfile(previous_filename, backup_filename)
+        mode = 'a'
+
+    with zipfile.ZipFile(backup_filename, mode, zipfile.ZIP_DEFLATED,
+                         compresslevel=BACKUP_COMPRESSLEVEL) as zip_file:
+        new_notes = [note for note in notes if note not in archived]
+        for info, data in _map_notes(_read_archive_entry, new_notes):
+            zip_file.writestr(info, data, zipfile.ZIP_DEFLATED,
+                              BACKUP_COMPRESSLEVEL)
 
     print(f'  Backup {backup_filename} was created!')
 
 
 def delete_old_backups() -> None:
     """
-    Deleting old backups
+    Deleting backups created before today. Creation date is taken from
+    backup`s filename, other files are checked by their creation time.
     """
-    now = datetime.datetime.now().date()
+    today = datetime.date.today()
+    today_iso = today.isoformat()
+    cutoff = time.mktime(today.timetuple())
 
-    for file in os.listdir(BACKUP_DIR):
-        full_path = os.path.join(BACKUP_DIR, file)
-        creation_time = os.path.getctime(full_path)
-        creation_date = datetime.datetime.fromtimestamp(creation_time).date()
-        if (now - creation_date).days >= 1:
-            os.remove(full_path)
+    with os.scandir(BACKUP_DIR) as it:
+        for entry in it:
+            match = BACKUP_PATTERN.fullmatch(entry.name)
+            if match is not None:
+                expired = match.group(1) < today_iso
+            else:
+                expired = entry.stat().st_ctime < cutoff
+            if expired:
+                os.remove(entry.path)
 
     print('  Old backups was deleted!')
 
@@ -278,23 +673,14 @@ def export_to_csv() -> None:
     """
     Exporting notes info CSV
     """
-    timestamp = datetime.datetime.now().date()
+    timestamp = datetime.date.today().isoformat()
     FILENAME = os.path.join(CSV_DIR, f'{timestamp}.csv')
 
-    notes = []
-    for _file in os.listdir(NOTES_DIR):
-        if _file.endswith(TXT_EXTENSION):
-            full_path = os.path.join(NOTES_DIR, _file)
-            with open(full_path, 'r') as file:
-                note_dict = defaultdict(str)
-                note_dict['title'] = _file
-                note_dict['content'] = file.read()
-            notes.append(note_dict)
-
-    with open(FILENAME, 'w') as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=['title', 'content'])
-        for note in notes:
-            writer.writerow(note)
+    with open(FILENAME, 'w', newline='',
+              buffering=WRITE_BUFFER_SIZE) as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['title', 'content'])
+        writer.writerows(_read_notes(_get_notes()))
 
     print('  Notes was exported into CSV')
 
@@ -303,24 +689,27 @@ def export_to_json() -> None:
     """
     Exporting notes info JSON
     """
-    timestamp = datetime.datetime.now().date()
+    timestamp = datetime.date.today().isoformat()
     FILENAME = os.path.join(JSON_DIR, f'{timestamp}.json')
 
-    notes = defaultdict(str)
-    for _file in os.listdir(NOTES_DIR):
-        if _file.endswith(TXT_EXTENSION):
-            with open(os.path.join(NOTES_DIR, _file), 'r') as file:
-                notes[_file] = file.read()
-
-    with open(FILENAME, 'w') as json_file:
-        json.dump(notes, json_file, indent=4, ensure_ascii=False)
+    with open(FILENAME, 'w', buffering=WRITE_BUFFER_SIZE) as json_file:
+        json_file.write('{')
+        notes = _read_notes(_get_notes())
+        for index, (note, content) in enumerate(notes):
+            if index:
+                json_file.write(', ')
+            json_file.write(json.dumps(note, ensure_ascii=False))
+            json_file.write(': ')
+            json_file.write(json.dumps(content, ensure_ascii=False))
+        json_file.write('}')
 
     print('  Notes was exported into JSON')
 
 
-def words_frequency(buffer: str) -> MutableMapping[str, int]:
+def words_frequency(buffer: str) -> Counter[str]:
     """
-    Created words frequency dictionary
+    Created words frequency dictionary. Words are lowercased and
+    punctuation is dropped.
 
     Parameters
     ------------
@@ -329,23 +718,24 @@ def words_frequency(buffer: str) -> MutableMapping[str, int]:
 
     Returns
     ------------
-    words_dict : MutableMapping[str, int]
+    words_dict : Counter[str]
         Words frequency dictionary
     """
-    words_dict: defaultdict[str, int] = defaultdict(int)
-    words = buffer.split(' ')
-    for word in words:
-        words_dict[word] += 1
-    return words_dict
+    return Counter(WORD_PATTERN.findall(buffer.lower()))
 
 
-def semantic_analysis():
+def semantic_analysis(notes: list[str]):
     """
     Creates semantic analysis of chosen note
 
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
+
     Returns
     ------------
-    words_freq : MutableMapping[str, int]
+    words_freq : Counter[str]
         Map which contains word frequency for chosen note
     title : str
         Title of note
@@ -355,12 +745,11 @@ def semantic_analysis():
     ValueError
         If `note_number` cannot be convert into `int`
     """
-    list_notes()
+    list_notes(notes)
     note_number = input('  Enter number of note you want to analyze: ')
 
     try:
         note_num = int(note_number)
-        notes = [f for f in os.listdir(NOTES_DIR) if f.endswith(TXT_EXTENSION)]
         if 1 <= note_num <= len(notes):
             full_path = os.path.join(NOTES_DIR, notes[note_num - 1])
             title = notes[note_num - 1].removesuffix(TXT_EXTENSION)
@@ -376,26 +765,44 @@ def semantic_analysis():
 
 def export_to_pdf() -> None:
     """
-    Converts notes to pdf
+    Converts notes to pdf. Export is skipped if today`s pdf already exists
+    and notes were not changed since it was created.
     """
-    timestamp = datetime.datetime.now().date()
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+
+    timestamp = datetime.date.today().isoformat()
     filename = os.path.join(PDF_DIR, f'{timestamp}.pdf')
-    canv = canvas.Canvas(filename, pagesize=A4)
 
-    notes = [f for f in os.listdir(NOTES_DIR) if f.endswith('.txt')]
+    notes = _get_notes()
+    signature = f'{filename}\0{_notes_signature(notes)}'
+    try:
+        with open(PDF_SIGNATURE_FILE, 'r') as file:
+            if file.read() == signature and os.path.exists(filename):
+                return
+    except OSError:
+        pass
+
+    canv = canvas.Canvas(filename, pagesize=A4)
 
     x = 15
-    y = 780
-    dy = 40
-    for note in notes:
-        with open(os.path.join(NOTES_DIR, note)) as file:
-            title = note.removesuffix(TXT_EXTENSION)
-            content = file.read()
-        canv.drawString(x, y, text=f'Title: {title}')
-        canv.drawString(x, y+dy, text=f'Content: {content}')
-        y += dy
+    top = 780
+    bottom = 40
+    text = canv.beginText(x, top)
+    for note, content in _read_notes(notes):
+        title = note.removesuffix(TXT_EXTENSION)
+        lines = [f'Title: {title}', *f'Content: {content}'.splitlines(), '']
+        for line in lines:
+            if text.getY() < bottom:
+                canv.drawText(text)
+                canv.showPage()
+                text = canv.beginText(x, top)
+            text.textLine(line)
+    canv.drawText(text)
 
     canv.save()
+    with open(PDF_SIGNATURE_FILE, 'w') as file:
+        file.write(signature)
 
 
 def statistics_by_date() -> Counter:
@@ -407,27 +814,35 @@ def statistics_by_date() -> Counter:
     counter : Counter
         User activity dictionary
     """
-    notes = [f for f in os.listdir(NOTES_DIR) if f.endswith(TXT_EXTENSION)]
-    dates = []
-    for note in notes:
-        path = os.path.join(NOTES_DIR, note)
-        creation_date = datetime.datetime.fromtimestamp(
-            os.path.getctime(path)).date()
-        dates.append(str(creation_date))
-    counter = Counter(dates)
+    with os.scandir(NOTES_DIR) as it:
+        dates = Counter(datetime.date.fromtimestamp(entry.stat().st_ctime)
+                        for entry in it
+                        if entry.name.endswith(TXT_EXTENSION))
+    counter = Counter({str(date): count for date, count in dates.items()})
     return counter
 
 
-def plot_semantic_analysis() -> None:
+def plot_semantic_analysis(notes: list[str]) -> None:
     """
-    Plots note`s semantic analysis
+    Plots `PLOT_TOP_WORDS` most frequent words of note
+
+    Parameters
+    ------------
+    notes : list[str]
+        Filenames of notes, in the order they are numbered
     """
-    words_freq, title = semantic_analysis()
-    plt.figure(figsize=(200, 100))
-    plt.bar(words_freq.keys(), words_freq.values())
+    import matplotlib.pyplot as plt
+
+    words_freq, title = semantic_analysis(notes)
+    top_words = words_freq.most_common(PLOT_TOP_WORDS)
+    plt.figure(figsize=(12, 6))
+    plt.bar([word for word, _ in top_words],
+            [count for _, count in top_words])
+    plt.xticks(rotation=45, ha='right')
     plt.title(f'{title} analysis')
     plt.ylabel('Количество вхождений')
     plt.xlabel('Слово')
+    plt.tight_layout()
     plt.show()
 
 
@@ -435,6 +850,8 @@ def plot_user_statistics() -> None:
     """
     Plots user activity statictics
     """
+    import matplotlib.pyplot as plt
+
     statistics = statistics_by_date()
     TITLE = 'User activity'
     XLABEL = 'Date'
@@ -450,44 +867,33 @@ def main_loop() -> None:
     """
     Main program loop
     """
+    _choice = 0
     while True:
-        print('1 - list of notes')
-        print('2 - search note by keyword')
-        print('3 - create note')
-        print('4 - open note')
-        print('5 - delete note permanently')
-        print('6 - send note to trash')
-        print('7 - update note')
-        print('8 - create new backup')
-        print('9 - delete old backups')
-        print('10 - export to JSON')
-        print('11 - export to CSV')
-        print('12 - export to PDF')
-        print('13 - note semantic analysis')
-        print('14 - activity diagram')
-        print('15 - EXIT')
+        sys.stdout.write(MENU)
 
         choice = (input('Enter your choice: '))
         try:
             _choice = int(choice)
         except ValueError:
             print('Your choice should be integer!')
+            continue
 
+        notes = _get_notes()
         match _choice:
             case 1:
-                list_notes()
+                list_notes(notes)
             case 2:
                 search_note_by_keyword()
             case 3:
                 create_note()
             case 4:
-                open_note()
+                open_note(notes)
             case 5:
-                delete_note()
+                delete_note(notes)
             case 6:
-                send_note_to_trash()
+                send_note_to_trash(notes)
             case 7:
-                update_note()
+                update_note(notes)
             case 8:
                 create_backup()
             case 9:
@@ -499,7 +905,7 @@ def main_loop() -> None:
             case 12:
                 export_to_pdf()
             case 13:
-                plot_semantic_analysis()
+                plot_semantic_analysis(notes)
             case 14:
                 plot_user_statistics()
             case 15: